@@ -1,22 +1,118 @@
+import time                 # Import time for measuring local search cost
+from itertools import combinations  # Import combinations for pairwise swaps
 import numpy as np          # Import numpy for array operations
 import pygad                # Import pygad for genetic algorithm
 from fitness import fitness_func, is_valid_solution
+from grid_utils import check_no_conflict
+
+# =====================================
+# Memetic repair: local search on near-perfect individuals
+# =====================================
+
+def local_search(solution, gene_space, max_steps=4):
+    """
+    Improve a GA solution with bounded hill climbing.
+    - Moves: swap two free cells in the same row, or reassign a free cell
+      to a value that does not conflict with its row, column, or block.
+    - Fixed cells (a single allowed value in gene_space) are never changed.
+    - Applies the best improving move up to max_steps times.
+    - Cost: each step makes one fitness call per move, at most 24 row swaps
+      plus 3 reassignments per free cell; near-perfect grids need far fewer.
+    Returns (improved_solution, fitness).
+    """
+    current = np.array(solution, dtype=int)                   # Work on an integer copy
+    best_fit = fitness_func(None, current, None)              # Fitness before any move
+    free = [i for i in range(16) if len(gene_space[i]) > 1]   # Indices of non-fixed cells
+    for _ in range(max_steps):                                # Bounded number of moves
+        if best_fit == 48:                                    # Already perfect, stop early
+            break
+        best_move = None
+        for r in range(4):                                    # Swap moves within each row
+            row_free = [i for i in free if i // 4 == r]
+            for a, b in combinations(row_free, 2):
+                if current[a] == current[b]:                  # Swapping equal values is a no-op
+                    continue
+                candidate = current.copy()
+                candidate[a], candidate[b] = current[b], current[a]
+                fit = fitness_func(None, candidate, None)
+                if fit > best_fit:
+                    best_fit, best_move = fit, candidate
+        grid = current.reshape(4, 4).copy()                   # Grid used for conflict checks
+        for i in free:                                        # Constraint-propagation repair moves
+            r, c = divmod(i, 4)
+            value = grid[r, c]
+            grid[r, c] = -1                                   # Blank the cell to look at its peers only
+            for val in gene_space[i]:
+                if val != value and check_no_conflict(grid, r, c, val):
+                    candidate = current.copy()
+                    candidate[i] = val
+                    fit = fitness_func(None, candidate, None)
+                    if fit > best_fit:
+                        best_fit, best_move = fit, candidate
+            grid[r, c] = value                                # Restore the cell
+        if best_move is None:                                 # Local optimum reached
+            break
+        current = best_move
+    return current, best_fit
 
 # =====================================
 # Run the genetic algorithm, collect solutions
 # =====================================
 
-def run_ga_solver(gene_space, letter_to_int, int_to_letter):
+def run_ga_solver(gene_space, letter_to_int, int_to_letter,
+                  memetic_top_k=20, memetic_min_fitness=44, memetic_max_steps=4,
+                  memetic_stats=None):
     """
     Run GA and collect all unique, valid solutions found during the process.
-    Show progress percentage.
+    After each generation, the top memetic_top_k individuals with fitness of at
+    least memetic_min_fitness are improved by local_search and written back.
+    Set memetic_top_k=0 to disable the local search.
+    Pass a dict as memetic_stats to receive the local search counters, the
+    cost of every generation it ran in, and when each new solution was found.
+    Show progress percentage and a summary of the local search cost.
     Returns (decoded_solutions, fitnesses, validations).
     """
     solutions = set()                          # Set of unique solution keys (tuples)
     decoded_solutions = []                     # List of grids (letters) for display
     fitnesses = []                             # Fitness scores for each found solution
     validations = []                           # Validation (True/False) for each solution
-    progress = {'current': 0}                  # Progress percentage tracker
+    progress = {'current': 0, 'start': 0.0}    # Progress percentage tracker and run start time
+    if memetic_stats is None:                  # Caller did not ask for the statistics
+        memetic_stats = {}
+    memetic_stats.update({
+        'searched': 0,                         # Individuals passed to local_search
+        'improved': 0,                         # Individuals local_search improved
+        'solved': 0,                           # New solutions found by local_search
+        'seconds': 0.0,                        # Total time spent in local search
+        'generations': [],                     # Per-generation cost of the local search
+        'first_solution_generation': None,     # Generation of the first solution (GA or search)
+        'first_solution_seconds': None,        # Seconds from run start to the first solution
+        'first_repair_generation': None,       # Generation of the first solution by local search
+        'first_repair_seconds': None,          # Seconds from run start to that solution
+        'solutions': [],                       # (generation, seconds, source) for every new solution
+    })
+
+    def record_solution(solution, generation, source):
+        # Collect a perfect solution if it has not been seen yet; returns True if new
+        grid = np.array(solution, dtype=int).reshape(4, 4) # Convert gene vector to 4x4 grid
+        key = tuple(grid.flatten())            # Use flattened tuple as unique key
+        if key in solutions:                   # Only collect if new
+            return False
+        print("\nI found one solution!")
+        solutions.add(key)                     # Add to set of solutions
+        decoded = np.vectorize(int_to_letter.get)(grid) # Decode grid to letters
+        decoded_solutions.append(decoded)      # Save decoded solution
+        fitnesses.append(48)                   # Save fitness (always 48 here)
+        validations.append(is_valid_solution(grid))    # Save validation result
+        seconds = time.perf_counter() - progress['start']  # Time since the run started
+        memetic_stats['solutions'].append((generation, seconds, source))
+        if memetic_stats['first_solution_generation'] is None:
+            memetic_stats['first_solution_generation'] = generation
+            memetic_stats['first_solution_seconds'] = seconds
+        if source == 'local_search' and memetic_stats['first_repair_generation'] is None:
+            memetic_stats['first_repair_generation'] = generation
+            memetic_stats['first_repair_seconds'] = seconds
+        return True
 
     def on_generation(ga_instance):
         # Show progress if percentage has increased
@@ -25,17 +121,32 @@ def run_ga_solver(gene_space, letter_to_int, int_to_letter):
             print(f"{percent}%...", end="", flush=True)
             progress['current'] = percent
         pop = ga_instance.population           # Population: each is a candidate solution
-        for solution in pop:                   # For each solution in this generation
-            grid = np.array(solution, dtype=int).reshape(4, 4) # Convert gene vector to 4x4 grid
-            if fitness_func(None, solution, None) == 48:       # If it's a perfect solution
-                key = tuple(grid.flatten())    # Use flattened tuple as unique key
-                if key not in solutions:       # Only collect if new
-                    print("\nI found one solution!")
-                    solutions.add(key)         # Add to set of solutions
-                    decoded = np.vectorize(int_to_letter.get)(grid) # Decode grid to letters
-                    decoded_solutions.append(decoded)          # Save decoded solution
-                    fitnesses.append(48)                       # Save fitness (always 48 here)
-                    validations.append(is_valid_solution(grid))# Save validation result
+        pop_fitness = ga_instance.last_generation_fitness # Scores PyGAD computed before this callback
+        for idx in np.flatnonzero(pop_fitness == 48):  # For each perfect solution in this generation
+            record_solution(pop[idx], ga_instance.generations_completed, 'ga')
+
+        if memetic_top_k <= 0:                 # Local search disabled
+            return
+        start = time.perf_counter()
+        step = {'generation': ga_instance.generations_completed, # Cost of this generation's search
+                'searched': 0, 'improved': 0, 'solved': 0, 'seconds': 0.0}
+        order = np.argsort(-pop_fitness, kind='stable')  # Best individuals first
+        near = [idx for idx in order if memetic_min_fitness <= pop_fitness[idx] < 48]
+        for idx in near[:memetic_top_k]:       # Top-k near-perfect individuals
+            repaired, fit = local_search(pop[idx], gene_space, memetic_max_steps)
+            step['searched'] += 1
+            if fit <= pop_fitness[idx]:        # No improvement, leave individual alone
+                continue
+            step['improved'] += 1
+            pop[idx] = repaired                # Feed repaired grid back into the population
+            pop_fitness[idx] = fit             # Keep selection in step with the repaired grid
+            if fit == 48 and record_solution(repaired, step['generation'], 'local_search'):
+                step['solved'] += 1
+        step['seconds'] = time.perf_counter() - start
+        if step['searched']:                   # Only keep generations where the search ran
+            memetic_stats['generations'].append(step)
+        for key in ('searched', 'improved', 'solved', 'seconds'):
+            memetic_stats[key] += step[key]
 
     # Configure and run the genetic algorithm
     ga = pygad.GA(
@@ -54,6 +165,23 @@ def run_ga_solver(gene_space, letter_to_int, int_to_letter):
         on_generation=on_generation,   # Callback at the end of every generation
     )
     print("0%...", end="", flush=True)
+    progress['start'] = time.perf_counter()
     ga.run()                              # Start the genetic algorithm
     print()                               # Newline after progress
+    if memetic_top_k > 0:                 # Report how much the local search cost
+        print(f"Local search: {memetic_stats['searched']} searched, "
+              f"{memetic_stats['improved']} improved, "
+              f"{memetic_stats['solved']} new solutions, "
+              f"{memetic_stats['seconds']:.2f}s over "
+              f"{len(memetic_stats['generations'])} generations")
+    if memetic_stats['first_solution_generation'] is not None:
+        print(f"First solution at generation {memetic_stats['first_solution_generation']} "
+              f"({memetic_stats['first_solution_seconds']:.2f}s)")
+    if memetic_stats['first_repair_generation'] is not None:
+        print(f"First solution from local search at generation "
+              f"{memetic_stats['first_repair_generation']} "
+              f"({memetic_stats['first_repair_seconds']:.2f}s)")
+    if memetic_stats['solutions']:
+        last_generation, last_seconds, _ = memetic_stats['solutions'][-1]
+        print(f"Last new solution at generation {last_generation} ({last_seconds:.2f}s)")
     return decoded_solutions, fitnesses, validations # Return results
@@ -1,7 +1,7 @@
 import unittest
 import numpy as np
 from unittest.mock import patch, MagicMock
-from ga_solver import run_ga_solver
+from ga_solver import run_ga_solver, local_search
 
 
 class TestGASolver(unittest.TestCase):
@@ -25,6 +25,7 @@ class TestGASolver(unittest.TestCase):
         mock_ga_instance.generations_completed = 1
         mock_ga_instance.num_generations = 10
         mock_ga_instance.population = [self.perfect_solution]
+        mock_ga_instance.last_generation_fitness = np.array([48])
 
         # Attach on_generation manually by extracting it from constructor args
         def fake_run():
@@ -50,6 +51,101 @@ class TestGASolver(unittest.TestCase):
         ])
         np.testing.assert_array_equal(decoded_solutions[0], expected_letters)
 
+    def test_local_search_swaps_within_row(self):
+        near = list(self.perfect_solution)
+        near[0], near[1] = near[1], near[0]       # One swap away from perfect
+        repaired, fit = local_search(near, self.gene_space)
+        self.assertEqual(fit, 48)
+        self.assertEqual(list(repaired), self.perfect_solution)
+
+    def test_local_search_repairs_conflicting_cell(self):
+        near = list(self.perfect_solution)
+        near[5] = 2                               # Duplicate 2 in row, column and block
+        repaired, fit = local_search(near, self.gene_space)
+        self.assertEqual(fit, 48)
+        self.assertEqual(list(repaired), self.perfect_solution)
+
+    def test_local_search_keeps_fixed_cells(self):
+        near = list(self.perfect_solution)
+        near[12] = near[0]                        # Same value twice in column 0
+        gene_space = list(self.gene_space)
+        gene_space[0], gene_space[12] = [near[0]], [near[12]]  # Fix both, so 48 is unreachable
+        repaired, fit = local_search(near, gene_space)
+        self.assertEqual(repaired[0], near[0])
+        self.assertEqual(repaired[12], near[12])
+        self.assertLess(fit, 48)
+        for i, value in enumerate(repaired):      # Every cell keeps an allowed value
+            self.assertIn(value, gene_space[i])
+
+    @patch('ga_solver.pygad.GA')
+    def test_run_ga_solver_collects_repaired_solution(self, MockGA):
+        near = list(self.perfect_solution)
+        near[0], near[1] = near[1], near[0]
+        mock_ga_instance = MagicMock()
+        mock_ga_instance.generations_completed = 1
+        mock_ga_instance.num_generations = 10
+        mock_ga_instance.population = [near]
+        mock_ga_instance.last_generation_fitness = np.array([46])
+
+        def fake_run():
+            on_generation = MockGA.call_args[1]['on_generation']
+            on_generation(mock_ga_instance)
+
+        mock_ga_instance.run = fake_run
+        MockGA.return_value = mock_ga_instance
+
+        stats = {}
+        decoded_solutions, fitnesses, validations = run_ga_solver(
+            self.gene_space, self.letter_to_int, self.int_to_letter,
+            memetic_stats=stats
+        )
+
+        self.assertEqual(len(decoded_solutions), 1)
+        self.assertEqual(fitnesses, [48])
+        self.assertEqual(validations, [True])
+        self.assertEqual(list(mock_ga_instance.population[0]), self.perfect_solution)
+        self.assertEqual(list(mock_ga_instance.last_generation_fitness), [48]) # Selection sees the repair
+        self.assertEqual((stats['searched'], stats['improved'], stats['solved']), (1, 1, 1))
+        self.assertEqual(stats['first_solution_generation'], 1)
+        self.assertEqual(stats['first_repair_generation'], 1)
+        self.assertEqual(len(stats['generations']), 1)
+        self.assertEqual(stats['generations'][0]['solved'], 1)
+        self.assertGreaterEqual(stats['first_solution_seconds'], 0.0)
+        self.assertEqual(stats['first_repair_seconds'], stats['first_solution_seconds'])
+        self.assertEqual(len(stats['solutions']), 1)
+        self.assertEqual(stats['solutions'][0][0], 1)
+        self.assertEqual(stats['solutions'][0][2], 'local_search')
+
+    @patch('ga_solver.pygad.GA')
+    def test_run_ga_solver_skips_generation_without_candidates(self, MockGA):
+        far = [0] * 16                            # Every row, column and block full of duplicates
+        mock_ga_instance = MagicMock()
+        mock_ga_instance.generations_completed = 1
+        mock_ga_instance.num_generations = 10
+        mock_ga_instance.population = [far]
+        mock_ga_instance.last_generation_fitness = np.array([12])
+
+        def fake_run():
+            on_generation = MockGA.call_args[1]['on_generation']
+            on_generation(mock_ga_instance)
+
+        mock_ga_instance.run = fake_run
+        MockGA.return_value = mock_ga_instance
+
+        stats = {}
+        decoded_solutions, _, _ = run_ga_solver(
+            self.gene_space, self.letter_to_int, self.int_to_letter,
+            memetic_stats=stats
+        )
+
+        self.assertEqual(decoded_solutions, [])
+        self.assertEqual(stats['searched'], 0)
+        self.assertEqual(stats['generations'], [])
+        self.assertEqual(stats['solutions'], [])
+        self.assertIsNone(stats['first_solution_seconds'])
+        self.assertIsNone(stats['first_repair_seconds'])
+        self.assertEqual(mock_ga_instance.population[0], far)  # Population left untouched
+
 
 if __name__ == '__main__':
     unittest.main()